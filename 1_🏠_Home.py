@@ -5,6 +5,8 @@ import pandas as pd
 import plotly.graph_objects as go
 from geopy.geocoders import Nominatim
 from datetime import timedelta, datetime, time
+from ensemble import get_ensemble_bands
+from model_runs import latest_model_run
 
 
 # Streamlit Page Setup for quick run
@@ -14,8 +16,10 @@ st.set_page_config(
     layout="wide"
 )
 
-@st.cache_data(ttl=timedelta(hours=1))
-def get_weather(latitude, longitude):
+# Keyed on the model run, so entries stay valid until upstream publishes a newer one;
+# the TTL and max_entries only evict runs that are no longer current
+@st.cache_data(ttl=timedelta(hours=24), max_entries=500)
+def get_weather(latitude, longitude, model_run):
     base_url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": latitude,
@@ -24,7 +28,11 @@ def get_weather(latitude, longitude):
         "forecast_days": 10
     }
     response = requests.get(base_url, params=params)
-    return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+    if response.status_code != 200:
+        return f"Error: {response.status_code}"
+    weather_data = response.json()
+    weather_data['model_run'] = model_run
+    return weather_data
 
 # No caching here, Nominatim may return unhashable objects
 def geocode(location):
@@ -121,6 +129,29 @@ def generate_weather_summary(df_filtered, num_days, location_name):
 
     return summaries
 
+def add_ensemble_summary(summaries, ensemble, start_date, end_date):
+    rain_probability = ensemble['rain_probability']
+    rain_probability = rain_probability[(rain_probability.index >= start_date.date()) & (rain_probability.index < end_date.date())]
+    likely_days = rain_probability[rain_probability >= 0.5]
+    num_days = (end_date - start_date).days
+
+    if rain_probability.empty:
+        summaries['rain'] += " No ensemble data for these days."
+    elif not likely_days.empty:
+        wettest_day = rain_probability.idxmax()
+        summaries['rain'] += f" Rain probability of 50% or more on {len(likely_days)} {'day' if len(likely_days) == 1 else 'days'}, highest {rain_probability.max():.0%} on {wettest_day.strftime('%A')}."
+    else:
+        summaries['rain'] += f" Rain probability stays below 50% (highest {rain_probability.max():.0%})."
+
+    if 0 < len(rain_probability) < num_days:
+        summaries['rain'] += f" (Ensemble covers the first {len(rain_probability)} of {num_days} days.)"
+
+    bands = ensemble['bands']
+    bands = bands[(bands['Time'] >= start_date) & (bands['Time'] < end_date)]
+    if not bands.empty:
+        summaries['temperature'] += f" {ensemble['member_count']}-member range: {bands['Temperature (°C) p10'].min():.1f}°C to {bands['Temperature (°C) p90'].max():.1f}°C."
+    return bands
+
 # UI starts
 st.title("⚡ Weather Forecast")
 
@@ -132,7 +163,7 @@ if location:
         st.stop()
 
     lat, lon = location_info.latitude, location_info.longitude
-    weather_data = get_weather(lat, lon)
+    weather_data = get_weather(lat, lon, latest_model_run(latitude=lat, longitude=lon))
 
     if not isinstance(weather_data, dict):
         st.error(f"Error fetching weather data: {weather_data}")
@@ -154,6 +185,8 @@ if location:
     end_date = start_date + timedelta(days=num_days)
     df_filtered = df[(df['Time'] >= start_date) & (df['Time'] < end_date)]
 
+    show_ensemble = st.toggle("Show forecast uncertainty (ensemble)", key="ensemble_toggle")
+
     summary_text = generate_weather_summary(df_filtered, num_days, location_info.address)
 
 
@@ -162,6 +195,13 @@ if location:
     # Assuming you have df_filtered, num_days, and location_name
     summaries = generate_weather_summary(df_filtered, num_days, location_info.address)
 
+    ensemble_bands = None
+    if show_ensemble:
+        ensemble = get_ensemble_bands(lat, lon, latest_model_run("ensemble", lat, lon))
+        if isinstance(ensemble, dict):
+            ensemble_bands = add_ensemble_summary(summaries, ensemble, start_date, end_date)
+        else:
+            st.warning(f"Ensemble forecast unavailable: {ensemble}")
 
     # Add custom CSS for card styling
     st.markdown("""
@@ -238,6 +278,13 @@ if location:
     fig.add_trace(go.Scatter(x=df_filtered['Time'], y=df_filtered['Cloud Cover (%)'], name="Cloud Cover", visible="legendonly", line=dict(color="grey")))
     fig.add_trace(go.Bar(x=df_filtered['Time'], y=df_filtered['Rain (mm)'], name="Rain", marker_color="lightblue", yaxis="y2"))
 
+    if ensemble_bands is not None:
+        # p10-p90 shaded band, p50 dotted
+        fig.add_trace(go.Scatter(x=ensemble_bands['Time'], y=ensemble_bands['Temperature (°C) p90'], line=dict(width=0), showlegend=False, hoverinfo="skip", legendgroup="temp_band"))
+        fig.add_trace(go.Scatter(x=ensemble_bands['Time'], y=ensemble_bands['Temperature (°C) p10'], name="Temperature 10-90%", fill="tonexty", fillcolor="rgba(255, 51, 0, 0.15)", line=dict(width=0), legendgroup="temp_band"))
+        fig.add_trace(go.Scatter(x=ensemble_bands['Time'], y=ensemble_bands['Temperature (°C) p50'], name="Temperature median", line=dict(color="#ff3300", dash="dot", width=1)))
+        fig.add_trace(go.Scatter(x=ensemble_bands['Time'], y=ensemble_bands['Precipitation (mm) p90'], name="Rain 90%", visible="legendonly", line=dict(color="steelblue", dash="dot"), yaxis="y2"))
+
     fig.update_layout(
         title=f"{num_days}-Day Weather Forecast",
         yaxis=dict(
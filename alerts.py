@@ -0,0 +1,238 @@
+"""Threshold alerts for a watch list of locations, run outside any Streamlit session.
+
+    python alerts.py watchlist.csv --queue alerts.jsonl --interval 900
+
+The watch list is a CSV with name, latitude, longitude columns. Each cycle fetches
+the forecasts in batches, stacks them into (locations, hours) arrays and evaluates
+the rules only for locations whose forecast changed since the previous cycle.
+Cycles where no newer model run has been published skip the download entirely.
+An alert is queued once per event: a (location, rule) pair is only written again
+when its first matching hour changes, or after it stopped matching.
+"""
+import argparse
+import json
+import operator
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from model_runs import latest_model_run
+
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+VARIABLES = ["rain", "windspeed_10m", "cloudcover"]
+BATCH_SIZE = 100  # locations per API request
+
+# Same thresholds generate_weather_summary uses on Home
+DEFAULT_RULES = [
+    {"name": "rain", "variable": "rain", "op": ">", "threshold": 0.1},
+    {"name": "strong_wind", "variable": "windspeed_10m", "op": ">", "threshold": 20},
+    {"name": "clear_sky", "variable": "cloudcover", "op": "<", "threshold": 30},
+]
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+def fetch_batch(latitudes, longitudes, forecast_days=3):
+    params = {
+        "latitude": ",".join(f"{lat:.4f}" for lat in latitudes),
+        "longitude": ",".join(f"{lon:.4f}" for lon in longitudes),
+        "hourly": VARIABLES,
+        "forecast_days": forecast_days
+    }
+    try:
+        response = requests.get(FORECAST_URL, params=params, timeout=30)
+    except requests.RequestException as e:
+        # Same as an error status: the batch is skipped and fetched again next cycle
+        return f"Error: {e}"
+    if response.status_code != 200:
+        return f"Error: {response.status_code}"
+    data = response.json()
+    # A single coordinate comes back as an object, several as a list
+    return data if isinstance(data, list) else [data]
+
+
+def fetch_forecasts(watchlist, forecast_days=3):
+    """Stacked forecasts: time axis, {variable: (locations, hours) float32} and a fetched mask."""
+    n = len(watchlist)
+    times = None
+    values = {}
+    fetched = np.zeros(n, dtype=bool)
+
+    for start in range(0, n, BATCH_SIZE):
+        batch = watchlist.iloc[start:start + BATCH_SIZE]
+        results = fetch_batch(batch['latitude'], batch['longitude'], forecast_days)
+        if not isinstance(results, list):
+            print(f"Error fetching locations {start}-{start + len(batch) - 1}: {results}")
+            continue
+
+        if times is None:
+            times = np.array(results[0]['hourly']['time'], dtype='datetime64[m]')
+            values = {v: np.full((n, len(times)), np.nan, dtype=np.float32) for v in VARIABLES}
+        for v in VARIABLES:
+            values[v][start:start + len(batch)] = np.array([r['hourly'][v] for r in results], dtype=float)
+        fetched[start:start + len(batch)] = True
+
+    return times, values, fetched
+
+
+def fingerprints(values):
+    # One 64-bit hash per location over all variables, so change detection is a vector compare
+    raw = np.concatenate([np.nan_to_num(values[v], nan=-1.0) for v in VARIABLES], axis=1)
+    words = np.ascontiguousarray(raw).view(np.uint32).astype(np.uint64)
+    weights = np.random.default_rng(0).integers(1, 2**63, size=words.shape[1], dtype=np.uint64) | np.uint64(1)
+    return (words * weights).sum(axis=1, dtype=np.uint64)
+
+
+def evaluate_rules(times, values, rows, rules):
+    """Alerts for the given location rows; all locations x hours are tested per rule at once."""
+    alerts = []
+    for rule in rules:
+        data = values[rule['variable']][rows]
+        with np.errstate(invalid="ignore"):
+            mask = OPERATORS[rule['op']](data, rule['threshold'])
+        hit = mask.any(axis=1)
+        if not hit.any():
+            continue
+
+        first_hour = mask.argmax(axis=1)
+        hour_count = mask.sum(axis=1)
+        matched = np.where(mask, data, np.nan)
+        peak = np.nanmax(matched[hit], axis=1) if rule['op'] in (">", ">=") else np.nanmin(matched[hit], axis=1)
+        for row, hour, count, value in zip(rows[hit], first_hour[hit], hour_count[hit], peak):
+            alerts.append({
+                "row": int(row),
+                "rule": rule['name'],
+                "first_time": str(times[hour]),
+                "hours": int(count),
+                "peak": round(float(value), 1)
+            })
+    return alerts
+
+
+class AlertEngine:
+    def __init__(self, watchlist, rules=DEFAULT_RULES, queue_path="alerts.jsonl", state_path=None, forecast_days=3):
+        self.watchlist = watchlist.reset_index(drop=True)
+        self.rules = rules
+        self.queue_path = queue_path
+        # np.savez appends .npz to any other path, so use the name it actually writes
+        if state_path and not state_path.endswith(".npz"):
+            state_path += ".npz"
+        self.state_path = state_path
+        self.forecast_days = forecast_days
+        self.times = None
+        self.model_run = None
+        self.hashes = np.zeros(len(self.watchlist), dtype=np.uint64)
+        # First matching hour of the last alert written per (location, rule); NaT = none active
+        self.emitted = np.full((len(self.watchlist), len(self.rules)), np.datetime64("NaT"), dtype='datetime64[m]')
+        self._load_state()
+
+    def _load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            state = np.load(self.state_path)
+            if len(state['hashes']) == len(self.watchlist):
+                self.times, self.hashes = state['times'], state['hashes']
+                self.model_run = int(state['model_run'])
+                if state['emitted'].shape == self.emitted.shape:
+                    self.emitted = state['emitted']
+
+    def _save_state(self):
+        if self.state_path:
+            np.savez(self.state_path, times=self.times, hashes=self.hashes, model_run=self.model_run or 0,
+                     emitted=self.emitted)
+
+    def run_cycle(self):
+        # Only runs of models covering a watched location count
+        model_run = max(latest_model_run(latitude=lat, longitude=lon)
+                        for lat, lon in zip(self.watchlist['latitude'], self.watchlist['longitude']))
+        if model_run == self.model_run:
+            print(f"No model run newer than {pd.Timestamp(model_run, unit='s')}, skipping")
+            return []
+
+        times, values, fetched = fetch_forecasts(self.watchlist, self.forecast_days)
+        if times is None:
+            return []
+
+        new_hashes = fingerprints(values)
+        # A shifted time axis means every forecast is new
+        same_axis = self.times is not None and np.array_equal(self.times, times)
+        changed = fetched & ((new_hashes != self.hashes) | (not same_axis))
+        rows = np.flatnonzero(changed)
+
+        started = time.perf_counter()
+        alerts = self._new_alerts(rows, evaluate_rules(times, values, rows, self.rules))
+        elapsed = time.perf_counter() - started
+
+        for alert in alerts:
+            alert['location'] = self.watchlist.at[alert.pop('row'), 'name']
+        self._write(alerts)
+
+        self.hashes = np.where(fetched, new_hashes, self.hashes)
+        self.times = times
+        # Only a complete cycle counts as having seen this run; partial failures retry next time
+        if fetched.all():
+            self.model_run = model_run
+        self._save_state()
+        print(f"{len(rows)}/{len(self.watchlist)} locations changed, {len(alerts)} alerts in {elapsed * 1000:.1f} ms")
+        return alerts
+
+    def _new_alerts(self, rows, alerts):
+        # Drop alerts already queued for the same event and remember the ones that aren't
+        rule_index = {rule['name']: i for i, rule in enumerate(self.rules)}
+        previous = self.emitted[rows]
+        self.emitted[rows] = np.datetime64("NaT")
+
+        new = []
+        for alert in alerts:
+            row, col = alert['row'], rule_index[alert['rule']]
+            first_time = np.datetime64(alert['first_time'], 'm')
+            self.emitted[row, col] = first_time
+            if previous[np.searchsorted(rows, row), col] != first_time:
+                new.append(alert)
+        return new
+
+    def _write(self, alerts):
+        if not alerts:
+            return
+        created = pd.Timestamp.now(tz="UTC").isoformat()
+        with open(self.queue_path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps({"created": created, **alert}) + "\n")
+
+
+def load_rules(path):
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+    for rule in rules:
+        if rule['variable'] not in VARIABLES or rule['op'] not in OPERATORS:
+            raise ValueError(f"Unsupported rule: {rule}")
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate weather alert rules over a watch list.")
+    parser.add_argument("watchlist", help="CSV with name, latitude, longitude columns")
+    parser.add_argument("--rules", help="JSON list of rules (default: the Home summary thresholds)")
+    parser.add_argument("--queue", default="alerts.jsonl", help="JSON-lines file alerts are appended to")
+    parser.add_argument("--state", default=".alerts_state.npz", help="Fingerprints of the last evaluated forecasts")
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between cycles; 0 runs once")
+    args = parser.parse_args()
+
+    engine = AlertEngine(
+        pd.read_csv(args.watchlist),
+        rules=load_rules(args.rules) if args.rules else DEFAULT_RULES,
+        queue_path=args.queue,
+        state_path=args.state
+    )
+    while True:
+        engine.run_cycle()
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
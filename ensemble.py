@@ -0,0 +1,84 @@
+import streamlit as st
+import requests
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+
+
+ENSEMBLE_URL = "https://ensemble-api.open-meteo.com/v1/ensemble"
+ENSEMBLE_VARIABLES = ["temperature_2m", "precipitation"]
+PERCENTILES = [10, 50, 90]
+
+
+# Keyed on the ensemble model run like get_weather on the pages (see model_runs.py)
+@st.cache_data(ttl=timedelta(hours=24), max_entries=200)
+def get_ensemble(latitude, longitude, model_run, model="icon_seamless", forecast_days=10):
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "hourly": ENSEMBLE_VARIABLES,
+        "models": model,
+        "forecast_days": forecast_days
+    }
+    response = requests.get(ENSEMBLE_URL, params=params)
+    if response.status_code != 200:
+        return f"Error: {response.status_code}"
+
+    # Keep only compact arrays in the cache, not the JSON: one (members, hours) float32 array per variable
+    hourly = response.json()['hourly']
+    members = {}
+    for variable in ENSEMBLE_VARIABLES:
+        keys = [variable] + sorted(k for k in hourly if k.startswith(f"{variable}_member"))
+        members[variable] = np.array([hourly[k] for k in keys], dtype=float).astype(np.float32)
+
+    # Ensemble models run shorter than forecast_days (ICON EPS ~7.5 days); the rest is null, so drop it
+    has_data = np.flatnonzero(np.any([~np.isnan(m).all(axis=0) for m in members.values()], axis=0))
+    horizon = has_data[-1] + 1 if len(has_data) else 0
+    return {
+        'time': np.array(hourly['time'], dtype='datetime64[m]')[:horizon],
+        'members': {variable: m[:, :horizon] for variable, m in members.items()}
+    }
+
+
+def percentile_bands(members):
+    # One reduction over every variable: (variables, members, hours) -> (variables, percentiles, hours)
+    stacked = np.stack([members[v] for v in ENSEMBLE_VARIABLES])
+    bands = np.nanpercentile(stacked, PERCENTILES, axis=1).transpose(1, 0, 2)
+    return {v: dict(zip(PERCENTILES, bands[i])) for i, v in enumerate(ENSEMBLE_VARIABLES)}
+
+
+def rain_probability(times, precipitation, threshold=0.1):
+    # Share of members with more than `threshold` mm in each day, counting only members with all 24
+    # hours of that day; partial days at the end of the horizon are dropped rather than under-reported
+    if not len(times):
+        return pd.Series(dtype=float)
+    days = times.astype('datetime64[D]')
+    day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    valid = ~np.isnan(precipitation)
+    daily_totals = np.add.reduceat(np.where(valid, precipitation, 0), day_starts, axis=1)
+    member_has_day = np.add.reduceat(valid.astype(int), day_starts, axis=1) >= 24
+    members_per_day = member_has_day.sum(axis=0)
+    wet = ((daily_totals > threshold) & member_has_day).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        probability = wet / members_per_day
+    return pd.Series(probability, index=pd.to_datetime(days[day_starts]).date).dropna()
+
+
+@st.cache_data(ttl=timedelta(hours=24), max_entries=200)
+def get_ensemble_bands(latitude, longitude, model_run, model="icon_seamless"):
+    # Memoized on top of the member cache, so reruns only pay for a lookup
+    ensemble = get_ensemble(latitude, longitude, model_run, model)
+    if not isinstance(ensemble, dict):
+        return ensemble
+
+    bands = percentile_bands(ensemble['members'])
+    df = pd.DataFrame({'Time': pd.to_datetime(ensemble['time'])})
+    for label, variable in [('Temperature (°C)', 'temperature_2m'), ('Precipitation (mm)', 'precipitation')]:
+        for p in PERCENTILES:
+            df[f"{label} p{p}"] = bands[variable][p]
+
+    return {
+        'bands': df,
+        'rain_probability': rain_probability(ensemble['time'], ensemble['members']['precipitation']),
+        'member_count': len(ensemble['members']['temperature_2m'])
+    }
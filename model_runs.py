@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+# Open-Meteo publishes a small metadata file per model with the time its latest run became
+# available. Probing these is much cheaper than downloading a forecast to find out it's unchanged.
+FORECAST_META_URL = "https://api.open-meteo.com/data/{model}/static/meta.json"
+ENSEMBLE_META_URL = "https://ensemble-api.open-meteo.com/data/{model}/static/meta.json"
+
+# Domains as (lat_min, lat_max, lon_min, lon_max), approximate; None = global
+ICON_EU = (29.5, 70.5, -23.5, 62.5)
+ICON_D2 = (43.2, 58.1, -3.9, 20.3)
+
+# Models behind the default "best_match" forecast: the global ones plus the regional models it
+# prefers where they cover a location (e.g. ICON-D2/EU and UKMO for London). A location's run key
+# only follows the models covering it, so an hourly US run doesn't refetch London.
+FORECAST_MODELS = {
+    "dwd_icon": None,
+    "ecmwf_ifs025": None,
+    "ncep_gfs013": None,
+    "ukmo_global_deterministic_10km": None,
+    "dwd_icon_eu": ICON_EU,
+    "dwd_icon_d2": ICON_D2,
+    "ukmo_uk_deterministic_2km": (48.0, 62.0, -12.0, 4.0),
+    "meteofrance_arpege_europe": (20.0, 72.0, -32.0, 42.0),
+    "meteofrance_arome_france0025": (37.5, 55.4, -12.0, 16.0),
+    "metno_nordic_pp": (52.0, 72.0, 0.0, 34.0),
+    "ncep_hrrr_conus": (21.0, 53.0, -135.0, -60.0),
+    "cmc_gem_hrdps": (27.0, 70.0, -152.0, -40.0),
+    "jma_msm": (22.4, 47.6, 120.0, 150.0),
+}
+
+# Members behind the "icon_seamless" ensemble used on Home
+ENSEMBLE_MODELS = {"dwd_icon_eps": None, "dwd_icon_eu_eps": ICON_EU, "dwd_icon_d2_eps": ICON_D2}
+
+PROBES = {
+    "forecast": (FORECAST_META_URL, FORECAST_MODELS),
+    "ensemble": (ENSEMBLE_META_URL, ENSEMBLE_MODELS),
+}
+
+PROBE_INTERVAL = 10 * 60  # seconds between metadata probes
+FALLBACK_INTERVAL = 60 * 60  # run key granularity when the probe fails, i.e. the old hourly TTL
+
+_last_probe = {group: {"time": 0.0, "runs": {}} for group in PROBES}
+_probe_locks = {group: threading.Lock() for group in PROBES}
+
+
+def _run_time(url):
+    # Any failure counts as "unknown" so latest_model_run falls back instead of raising
+    try:
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        return response.json()['last_run_availability_time']
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+
+
+def _probe(group):
+    # All models at once, so a probe costs one round trip rather than one per model
+    meta_url, models = PROBES[group]
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        runs = executor.map(_run_time, [meta_url.format(model=m) for m in models])
+    return {model: run for model, run in zip(models, runs) if run is not None}
+
+
+def _covers(domain, latitude, longitude):
+    if domain is None or latitude is None:
+        return True
+    lat_min, lat_max, lon_min, lon_max = domain
+    return lat_min <= latitude <= lat_max and lon_min <= longitude <= lon_max
+
+
+def latest_model_run(group="forecast", latitude=None, longitude=None):
+    """Unix time the newest upstream model run of `group` ("forecast" or "ensemble") became available.
+
+    With a point, only models whose domain covers it count; without one, every model does.
+
+    Pass it to a cached fetch function as an argument: the cache then keeps serving an entry
+    until a newer run exists, and refetches as soon as one does. Probes are shared by every
+    session in the process and repeated at most every PROBE_INTERVAL.
+    """
+    _refresh(group)
+    models = PROBES[group][1]
+    runs = [run for model, run in _last_probe[group]['runs'].items() if _covers(models[model], latitude, longitude)]
+    if not runs:
+        return int(time.time() // FALLBACK_INTERVAL * FALLBACK_INTERVAL)
+    return max(runs)
+
+
+def _refresh(group):
+    # One caller per group probes. The others keep using the previous result while it does, and
+    # only wait when there is nothing to serve yet (the first probe after start-up).
+    probe = _last_probe[group]
+    if time.time() - probe['time'] < PROBE_INTERVAL:
+        return
+    lock = _probe_locks[group]
+    if not lock.acquire(blocking=probe['time'] == 0.0):
+        return
+    try:
+        if time.time() - probe['time'] >= PROBE_INTERVAL:
+            runs = _probe(group)
+            probe['runs'], probe['time'] = runs, time.time()
+    finally:
+        lock.release()
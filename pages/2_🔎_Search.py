@@ -5,6 +5,7 @@ import plotly.express as px
 from geopy.geocoders import Nominatim
 from datetime import timedelta
 import importlib
+from model_runs import latest_model_run
 
 st.set_page_config(
     page_title="🔎 Search by location",
@@ -15,8 +16,9 @@ st.set_page_config(
 
 
 # Functions
-@st.cache_data(ttl=timedelta(hours=1))
-def get_weather(latitude, longitude):
+# model_run is only part of the cache key (see model_runs.py)
+@st.cache_data(ttl=timedelta(hours=24), max_entries=500)
+def get_weather(latitude, longitude, model_run):
     base_url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": latitude,
@@ -25,7 +27,11 @@ def get_weather(latitude, longitude):
         "forecast_days": 10
     }
     response = requests.get(base_url, params=params)
-    return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+    if response.status_code != 200:
+        return f"Error: {response.status_code}"
+    weather_data = response.json()
+    weather_data['model_run'] = model_run
+    return weather_data
 
 @st.cache_data(ttl=timedelta(hours=24))
 def geocode(location):
@@ -50,7 +56,7 @@ if not location_info:
 lat, lon = location_info.latitude, location_info.longitude
 st.success(f"Showing forecast for {location_info.address}")
 
-weather_data = get_weather(lat, lon)
+weather_data = get_weather(lat, lon, latest_model_run(latitude=lat, longitude=lon))
 
 if not isinstance(weather_data, dict):
     st.error(f"Error fetching weather data: {weather_data}")
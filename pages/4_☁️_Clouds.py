@@ -4,6 +4,7 @@ import pandas as pd
 import plotly.express as px
 from geopy.geocoders import Nominatim
 from datetime import timedelta
+from solar import sun_times, local_timezone, utc_offset, to_local
 
 st.set_page_config(page_title="Cloud Cover Forecast", 
                    page_icon="☁️", 
@@ -18,9 +19,7 @@ def get_weather(latitude, longitude):
         "latitude": latitude,
         "longitude": longitude,
         "hourly": ["cloudcover", "temperature_2m"],
-        "daily": ["sunrise", "sunset"],
-        "forecast_days": 10,
-        "timezone": "auto"
+        "forecast_days": 10
     }
     response = requests.get(base_url, params=params)
     return response.json() if response.status_code == 200 else None
@@ -43,14 +42,20 @@ if location:
         st.success(f"Showing forecast for {location_info.address}")
 
         weather_data = get_weather(lat, lon)
+
+        # Sunrise/sunset computed locally, so the request stays the plain hourly shape
+        offset = utc_offset(local_timezone(lat, lon))
+        sun_dates = pd.date_range((pd.Timestamp.now(tz="UTC").tz_localize(None) + offset).normalize(), periods=10, freq='D')
+        sunrise, sunset = sun_times(sun_dates.values, lat, lon)
         sun_df = pd.DataFrame({
-            'Date': pd.to_datetime(weather_data['daily']['time']),
-            'Sunrise': pd.to_datetime(weather_data['daily']['sunrise']),
-            'Sunset': pd.to_datetime(weather_data['daily']['sunset'])
+            'Date': sun_dates,
+            'Sunrise': to_local(sunrise, offset),
+            'Sunset': to_local(sunset, offset)
         })
         if weather_data:
+            # API times are GMT; shift them to the location's current local offset
             df = pd.DataFrame({
-                'Time': pd.to_datetime(weather_data['hourly']['time']),
+                'Time': to_local(pd.to_datetime(weather_data['hourly']['time']), offset),
                 'Cloud Cover (%)': weather_data['hourly']['cloudcover'],
                 'Temperature (°C)': weather_data['hourly']['temperature_2m']
             })
@@ -89,7 +94,7 @@ if location:
             sun_df['SortableDate'] = sun_df['Date'].dt.date
             sun_df['Date'] = sun_df['Date'].dt.strftime('%a %d %b')
 
-            for _, row in sun_df.iterrows():
+            for _, row in sun_df.dropna().iterrows():
                 if row['SortableDate'] in pivoted_data.index:  # Only add lines for dates in our heatmap
                     sunrise_hour = row['Sunrise'].hour + row['Sunrise'].minute / 60
                     sunset_hour = row['Sunset'].hour + row['Sunset'].minute / 60
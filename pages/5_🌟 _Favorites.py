@@ -1,9 +1,13 @@
 import streamlit as st
 import requests
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from model_runs import latest_model_run
 
 # Page configuration
 st.set_page_config(
@@ -14,8 +18,9 @@ st.set_page_config(
 )
 
 # Functions
-@st.cache_data(ttl=timedelta(hours=1))
-def get_weather(latitude, longitude):
+# model_run is only part of the cache key (see model_runs.py)
+@st.cache_data(ttl=timedelta(hours=24), max_entries=500)
+def get_weather(latitude, longitude, model_run):
     base_url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": latitude,
@@ -25,12 +30,21 @@ def get_weather(latitude, longitude):
         "forecast_days": 10
     }
     response = requests.get(base_url, params=params)
-    return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+    if response.status_code != 200:
+        return f"Error: {response.status_code}"
+    weather_data = response.json()
+    weather_data['model_run'] = model_run
+    return weather_data
+
+# One limiter for every session and worker thread: Nominatim allows at most 1 request per second.
+# Errors are raised rather than returned as None, so a failed lookup isn't cached as "not found".
+@st.cache_resource
+def get_geocoder():
+    return RateLimiter(Nominatim(user_agent="weather_app").geocode, min_delay_seconds=1, swallow_exceptions=False)
 
 @st.cache_data(ttl=timedelta(hours=24))
 def geocode(location):
-    geolocator = Nominatim(user_agent="weather_app")
-    return geolocator.geocode(location)
+    return get_geocoder()(location)
 
 # Main content
 st.title("🌟  Favorites of developer ")
@@ -43,40 +57,28 @@ if not selected_locations:
     st.warning("Please select at least one location to compare.")
     st.stop()
 
-# Fetch and process weather data
-all_data = []
-
-for location in selected_locations:
+# Fetch one location end to end; runs in a worker thread, so no st.* output here.
+# Cold geocodes queue on the rate limiter, forecasts are fetched concurrently.
+def fetch_location(location):
     try:
         location_info = geocode(location)
-        if location_info:
-            lat, lon = location_info.latitude, location_info.longitude
-            weather_data = get_weather(lat, lon)
-            
-            if isinstance(weather_data, dict):
-                hourly_data = weather_data['hourly']
-                df = pd.DataFrame({
-                    'Time': pd.to_datetime(hourly_data['time']),
-                    'Temperature (°C)': hourly_data['temperature_2m'],
-                    'Humidity (%)': hourly_data['relativehumidity_2m'],
-                    'Cloud Cover (%)': hourly_data['cloudcover'],
-                    'Location': location
-                })
-                all_data.append(df)
-            else:
-                st.error(f"Error fetching weather data for {location}: {weather_data}")
-        else:
-            st.error(f"Location not found: {location}")
+        if not location_info:
+            return location, f"Location not found: {location}"
+
+        weather_data = get_weather(location_info.latitude, location_info.longitude,
+                                   latest_model_run(latitude=location_info.latitude, longitude=location_info.longitude))
+        if not isinstance(weather_data, dict):
+            return location, f"Error fetching weather data for {location}: {weather_data}"
+
+        hourly_data = weather_data['hourly']
+        return location, pd.DataFrame({
+            'Time': pd.to_datetime(hourly_data['time']),
+            'Temperature (°C)': hourly_data['temperature_2m'],
+            'Humidity (%)': hourly_data['relativehumidity_2m'],
+            'Cloud Cover (%)': hourly_data['cloudcover'],
+        })
     except Exception as e:
-        st.error(f"An error occurred for {location}: {str(e)}")
-
-if not all_data:
-    st.error("No data available for comparison.")
-    st.stop()
-
-# Combine all data
-combined_df = pd.concat(all_data, ignore_index=True)
-combined_df['Day'] = combined_df['Time'].dt.strftime('%a %d %b')
+        return location, f"An error occurred for {location}: {str(e)}"
 
 # Create and display graphs
 st.subheader("10-Day Weather Forecast Comparison")
@@ -96,44 +98,75 @@ line_styles = {
     "Cairo Egypt": {"width": 1}
 }
 
+metrics = ['Temperature (°C)', 'Humidity (%)', 'Cloud Cover (%)']
 
-for metric in ['Temperature (°C)', 'Humidity (%)', 'Cloud Cover (%)']:
-    fig = px.line(combined_df, x='Time', y=metric, color='Location',
-                  title=f'{metric} Forecast Comparison', color_discrete_map=color_map)
-    
-# Customize line styles
-    for i, location in enumerate(fig.data):
-        location_name = location.name
-        if location_name in line_styles:
-            fig.data[i].line.update(line_styles[location_name])
+# Pre-allocate every slot so results can be drawn as soon as each location arrives
+errors = st.container()
+figures = {}
+chart_placeholders = {}
+for metric in metrics:
+    figures[metric] = go.Figure()
+    figures[metric].update_layout(title=f'{metric} Forecast Comparison', height=500, legend_title_text='Location')
+    figures[metric].update_yaxes(title_text=metric)
+    chart_placeholders[metric] = st.empty()
+    chart_placeholders[metric].info(f"Loading {metric} forecasts...")
 
-    fig.update_layout(height=500, legend_title_text='Location')
+# Current Weather Section
+st.header("Current Weather")
+current_weather = dict(zip(selected_locations, st.columns(len(selected_locations))))
+for location, column in current_weather.items():
+    with column:
+        st.subheader(location)
+
+def add_day_markers(fig, times):
+    days = times[::24]
     fig.update_xaxes(
         title_text='Date',
         tickmode='array',
-        tickvals=combined_df['Time'][::24],
-        ticktext=combined_df['Day'][::24],
+        tickvals=days,
+        ticktext=days.dt.strftime('%a %d %b'),
         tickangle=45
     )
-    fig.update_yaxes(title_text=metric)
-    
     # Add vertical lines for each day
-    for day in combined_df['Time'][::24]:
+    for day in days:
         fig.add_vline(x=day, line_width=1, line_dash="dash", line_color="lightblue")
-    
-    st.plotly_chart(fig, use_container_width=True)
-
-# Current Weather Section
-st.header("Current Weather")
-current_weather = st.columns(len(selected_locations))
 
-for i, location in enumerate(selected_locations):
-    with current_weather[i]:
-        st.subheader(location)
-        current_data = combined_df[combined_df['Location'] == location].iloc[0]
-        st.metric("Temperature", f"{current_data['Temperature (°C)']:.1f}°C")
-        st.metric("Humidity", f"{current_data['Humidity (%)']:.1f}%")
-        st.metric("Cloud Cover", f"{current_data['Cloud Cover (%)']:.1f}%")
+# Fetch concurrently and render in completion order
+loaded = 0
+# Probe here so the workers only look up their location's run in the cached result
+latest_model_run()
+ctx = get_script_run_ctx()
+with ThreadPoolExecutor(max_workers=len(selected_locations), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+    futures = [executor.submit(fetch_location, location) for location in selected_locations]
+    for future in as_completed(futures):
+        location, df = future.result()
+        if not isinstance(df, pd.DataFrame):
+            errors.error(df)
+            with current_weather[location]:
+                st.caption("No data")
+            continue
+
+        for metric in metrics:
+            fig = figures[metric]
+            if loaded == 0:
+                add_day_markers(fig, df['Time'])
+            fig.add_trace(go.Scatter(x=df['Time'], y=df[metric], name=location, mode='lines',
+                                     line=dict(color=color_map.get(location), **line_styles.get(location, {})),
+                                     legendrank=selected_locations.index(location)))
+            chart_placeholders[metric].plotly_chart(fig, use_container_width=True)
+
+        current_data = df.iloc[0]
+        with current_weather[location]:
+            st.metric("Temperature", f"{current_data['Temperature (°C)']:.1f}°C")
+            st.metric("Humidity", f"{current_data['Humidity (%)']:.1f}%")
+            st.metric("Cloud Cover", f"{current_data['Cloud Cover (%)']:.1f}%")
+        loaded += 1
+
+if not loaded:
+    for placeholder in chart_placeholders.values():
+        placeholder.empty()
+    st.error("No data available for comparison.")
+    st.stop()
 
 # Additional Information
 st.info(f"Data is updated hourly. Last update: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
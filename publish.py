@@ -0,0 +1,181 @@
+"""Pre-render the default views to static HTML, once per upstream model run.
+
+    python publish.py --out snapshots --live-url https://weather.example.com --interval 600
+
+Each page script runs headlessly with its default inputs (via Streamlit's AppTest), so the
+snapshots use exactly the pages' own data and figure code. The rendered elements are then
+written out as static HTML next to one shared plotly.min.js, which any static file server can
+hand out without starting a Streamlit session. --inline-plotlyjs embeds plotly.js in every page
+instead, for snapshots that are opened offline as single files.
+"""
+import argparse
+import html
+import json
+import os
+import time
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+from streamlit.testing.v1 import AppTest
+
+from model_runs import latest_model_run
+
+
+# (output file, page script, path of the page in the live app)
+SNAPSHOTS = [
+    ("index.html", "1_🏠_Home.py", ""),
+    ("favorites.html", "pages/5_🌟 _Favorites.py", "Favorites"),
+    ("search.html", "pages/2_🔎_Search.py", "Search"),
+]
+
+PAGE_STYLE = """
+<style>
+    body { font-family: "Source Sans Pro", sans-serif; color: #31333f; max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
+    .columns { display: flex; gap: 1rem; margin-bottom: 1rem; }
+    .column { flex: 1 1 0; min-width: 0; }
+    .alert { padding: 1rem; border-radius: 0.5rem; margin: 1rem 0; }
+    .alert.success { background: #dff5e3; color: #177233; }
+    .alert.info { background: #e1effe; color: #0b4a8b; }
+    .alert.warning { background: #fffce7; color: #926c05; }
+    .alert.error { background: #ffe8e8; color: #9e1c1c; }
+    .metric-label { font-size: 0.875rem; }
+    .metric-value { font-size: 2.25rem; }
+    .metric-delta { font-size: 0.875rem; color: #09ab3b; }
+    .caption { font-size: 0.875rem; color: rgba(49, 51, 63, 0.6); }
+    .live-link { margin: 1rem 0; }
+</style>
+"""
+
+# Locations the default views show (London, Cesme, Xanthi, Cairo); only runs covering them republish
+SNAPSHOT_POINTS = [(51.51, -0.13), (38.32, 26.30), (41.13, 24.89), (30.04, 31.24)]
+
+HEADINGS = {"title": "h1", "header": "h2", "subheader": "h3"}
+
+
+class SnapshotRenderer:
+    def __init__(self, plotlyjs=True):
+        # True embeds plotly.js in the page; a path to a .js file references it instead
+        self.plotlyjs = plotlyjs
+        self.plotly_included = False
+
+    def render(self, node):
+        kind = getattr(node, "type", "")
+        children = getattr(node, "children", None)
+
+        if kind in HEADINGS:
+            return f"<{HEADINGS[kind]}>{html.escape(node.value)}</{HEADINGS[kind]}>"
+        if kind == "markdown":
+            # The pages only use st.markdown/st.write for HTML (cards, styles, links)
+            return node.value
+        if kind == "caption":
+            return f'<p class="caption">{html.escape(node.value)}</p>'
+        if kind in ("success", "info", "warning", "error"):
+            return f'<div class="alert {kind}">{html.escape(node.value)}</div>'
+        if kind == "metric":
+            delta = f'<div class="metric-delta">{html.escape(node.delta)}</div>' if node.delta else ""
+            return (f'<div class="metric"><div class="metric-label">{html.escape(node.label)}</div>'
+                    f'<div class="metric-value">{html.escape(node.value)}</div>{delta}</div>')
+        if kind == "divider":
+            return "<hr>"
+        if kind == "plotly_chart":
+            return self.render_plotly(node.proto)
+        if kind == "column":
+            return f'<div class="column">{self.render_children(children)}</div>'
+        if children is not None:
+            if any(getattr(child, "type", "") == "column" for child in children.values()):
+                return f'<div class="columns">{self.render_children(children)}</div>'
+            return self.render_children(children)
+        # Input widgets and anything else interactive only exist in the live app
+        return ""
+
+    def render_children(self, children):
+        return "\n".join(self.render(child) for child in children.values())
+
+    def render_plotly(self, chart):
+        fig = pio.from_json(chart.spec)
+        config = json.loads(chart.config) if chart.config else {}
+        # Load plotly.js once per page, later charts reuse it
+        fig_html = pio.to_html(fig, config=config, full_html=False, include_plotlyjs=False if self.plotly_included else self.plotlyjs,
+                               default_width="100%")
+        self.plotly_included = True
+        return fig_html
+
+
+def render_page(script, live_url, plotlyjs=True, timeout=120):
+    at = AppTest.from_file(script, default_timeout=timeout).run()
+    if at.exception:
+        raise RuntimeError(f"{script} failed: {at.exception[0].message}")
+
+    body = SnapshotRenderer(plotlyjs).render(at.main)
+    title = html.escape(at.title[0].value) if at.title else "Weather Forecast"
+    live_link = f'<p class="live-link"><a href="{html.escape(live_url)}">Search another location or change the view in the live app →</a></p>' if live_url else ""
+    generated = pd.Timestamp.now(tz="UTC").strftime('%Y-%m-%d %H:%M UTC')
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{PAGE_STYLE}
+</head>
+<body>
+{live_link}
+{body}
+<p class="caption">Snapshot generated {generated}.</p>
+</body>
+</html>
+"""
+
+
+def publish(out_dir, live_url=None, inline_plotlyjs=False):
+    """Render every snapshot; returns False if any page had to be skipped."""
+    os.makedirs(out_dir, exist_ok=True)
+    plotlyjs = True
+    if not inline_plotlyjs:
+        # One cacheable copy for all snapshots instead of ~4 MB inlined in each
+        with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        plotlyjs = "plotly.min.js"
+
+    complete = True
+    for filename, script, live_path in SNAPSHOTS:
+        url = f"{live_url.rstrip('/')}/{live_path}" if live_url else None
+        try:
+            page = render_page(script, url, plotlyjs)
+        except Exception as e:
+            # Leave the previous snapshot in place rather than publishing a broken one
+            print(f"Skipping {filename}: {e}")
+            complete = False
+            continue
+
+        # Write then rename, so the server never hands out a half-written file
+        path = os.path.join(out_dir, filename)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(page)
+        os.replace(path + ".tmp", path)
+        print(f"Published {path}")
+    return complete
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish static snapshots of the default views.")
+    parser.add_argument("--out", default="snapshots", help="Directory the HTML files are written to")
+    parser.add_argument("--live-url", help="Base URL of the live app, linked from each snapshot")
+    parser.add_argument("--inline-plotlyjs", action="store_true", help="Embed plotly.js in every page instead of sharing one plotly.min.js, for offline use")
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between model run checks; 0 publishes once")
+    args = parser.parse_args()
+
+    published_run = None
+    while True:
+        model_run = max(latest_model_run(latitude=lat, longitude=lon) for lat, lon in SNAPSHOT_POINTS)
+        # A run only counts as published once every page made it; otherwise retry next interval
+        if model_run != published_run and publish(args.out, args.live_url, args.inline_plotlyjs):
+            published_run = model_run
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from timezonefinder import TimezoneFinder
+
+
+# NOAA solar calculator (https://gml.noaa.gov/grad/solcalc/calcdetails.html),
+# vectorized so a whole forecast range or a list of locations is one call.
+# Apparent sunrise/sunset: sun's centre 0.833° below the horizon (refraction + disc).
+SUN_ZENITH = 90.833
+
+_tf = TimezoneFinder()
+
+
+def local_timezone(latitude, longitude):
+    # Offline lookup; open sea has no zone, fall back to the nautical one
+    tz = _tf.timezone_at(lat=latitude, lng=longitude)
+    if tz is None:
+        offset = int(round(longitude / 15))
+        tz = "UTC" if offset == 0 else f"Etc/GMT{-offset:+d}"
+    return tz
+
+
+def sun_times(dates, latitude, longitude):
+    """Sunrise and sunset in UTC for each date, broadcast against latitude/longitude.
+
+    Returns two datetime64 arrays; NaT where the sun does not rise or set (polar day/night).
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.asarray(longitude, dtype=float)
+
+    # Julian century at approximate local solar noon
+    jd = days.astype(float) + 2440587.5 + 0.5 - lon / 360
+    t = (jd - 2451545) / 36525
+
+    mean_long = np.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360)
+    mean_anom = np.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    eccent = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+
+    eq_of_ctr = (np.sin(mean_anom) * (1.914602 - t * (0.004817 + 0.000014 * t))
+                 + np.sin(2 * mean_anom) * (0.019993 - 0.000101 * t)
+                 + np.sin(3 * mean_anom) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * t)
+    app_long = np.radians(np.degrees(mean_long) + eq_of_ctr - 0.00569 - 0.00478 * np.sin(omega))
+
+    mean_obliq = 23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+    obliq = np.radians(mean_obliq + 0.00256 * np.cos(omega))
+    decl = np.arcsin(np.sin(obliq) * np.sin(app_long))
+
+    # Equation of time in minutes
+    y = np.tan(obliq / 2) ** 2
+    eq_time = 4 * np.degrees(
+        y * np.sin(2 * mean_long)
+        - 2 * eccent * np.sin(mean_anom)
+        + 4 * eccent * y * np.sin(mean_anom) * np.cos(2 * mean_long)
+        - 0.5 * y ** 2 * np.sin(4 * mean_long)
+        - 1.25 * eccent ** 2 * np.sin(2 * mean_anom)
+    )
+
+    with np.errstate(invalid="ignore"):
+        hour_angle = np.degrees(np.arccos(
+            np.cos(np.radians(SUN_ZENITH)) / (np.cos(lat) * np.cos(decl)) - np.tan(lat) * np.tan(decl)
+        ))
+
+    # Minutes after UTC midnight of each date
+    solar_noon = 720 - 4 * lon - eq_time
+    midnight = days.astype("datetime64[s]")
+
+    def to_datetime(minutes):
+        seconds = np.round(minutes * 60)
+        return np.where(np.isnan(seconds), np.datetime64("NaT"),
+                        midnight + np.nan_to_num(seconds).astype("timedelta64[s]"))
+
+    return to_datetime(solar_noon - 4 * hour_angle), to_datetime(solar_noon + 4 * hour_angle)
+
+
+def utc_offset(tz, at=None):
+    # Offset of tz at `at` (default now); one value for a whole forecast window
+    at = pd.Timestamp.now(tz="UTC") if at is None else pd.Timestamp(at).tz_localize("UTC")
+    return at.tz_convert(tz).utcoffset()
+
+
+def to_local(times, offset):
+    # UTC datetimes -> naive local times with a single fixed offset, like the API's timezone="auto".
+    # Following DST here would repeat or skip an hour and break the Clouds date x hour pivot.
+    return pd.DatetimeIndex(times) + offset
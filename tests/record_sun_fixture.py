@@ -0,0 +1,50 @@
+"""Re-record fixtures/sun_times.json from the Open-Meteo archive API.
+
+    python tests/record_sun_fixture.py
+
+One request per day, so each entry carries the UTC offset that applied on that date.
+Days the API reports without a sunrise/sunset (polar day/night) are kept as null.
+"""
+import json
+import os
+
+import requests
+
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sun_times.json")
+
+
+def record_day(latitude, longitude, date):
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": date,
+        "end_date": date,
+        "daily": ["sunrise", "sunset"],
+        "timezone": "auto"
+    }
+    response = requests.get(ARCHIVE_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+    return {
+        "date": date,
+        "utc_offset_seconds": data['utc_offset_seconds'],
+        "sunrise": data['daily']['sunrise'][0],
+        "sunset": data['daily']['sunset'][0]
+    }
+
+
+def main():
+    with open(FIXTURE, encoding="utf-8") as f:
+        fixture = json.load(f)
+    for location in fixture['locations']:
+        location['days'] = [record_day(location['latitude'], location['longitude'], day['date']) for day in location['days']]
+    fixture['source'] = "Recorded from the Open-Meteo archive API (daily sunrise/sunset, timezone=auto)."
+    with open(FIXTURE, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+import alerts
+
+
+TIMES = np.arange("2026-10-19T00:00", "2026-10-19T06:00", dtype="datetime64[h]").astype("datetime64[m]")
+
+
+def make_values(rows=3):
+    return {v: np.zeros((rows, len(TIMES)), dtype=np.float32) + 50 for v in alerts.VARIABLES}
+
+
+def test_fingerprints_change_only_for_changed_rows():
+    values = make_values()
+    before = alerts.fingerprints(values)
+    assert len(set(before.tolist())) == 1
+
+    values['rain'][1, 4] = 0.3
+    after = alerts.fingerprints(values)
+    assert (after != before).tolist() == [False, True, False]
+
+
+def test_fingerprints_treat_missing_values_consistently():
+    values = make_values()
+    values['cloudcover'][0, 0] = np.nan
+    assert alerts.fingerprints(values)[0] == alerts.fingerprints(values)[0]
+    assert alerts.fingerprints(values)[0] != alerts.fingerprints(make_values())[0]
+
+
+def test_evaluate_rules_reports_first_hour_count_and_peak():
+    values = make_values()
+    values['rain'][0] = 0
+    values['rain'][0, 2:4] = [0.5, 1.2]
+    values['rain'][2] = 0
+    values['cloudcover'][2, 5] = 10
+
+    found = alerts.evaluate_rules(TIMES, values, np.array([0, 2]), alerts.DEFAULT_RULES)
+    by_rule = {(a['row'], a['rule']): a for a in found}
+
+    assert by_rule[(0, 'rain')] == {"row": 0, "rule": "rain", "first_time": "2026-10-19T02:00", "hours": 2, "peak": 1.2}
+    assert by_rule[(2, 'clear_sky')]['peak'] == 10
+    assert by_rule[(2, 'clear_sky')]['first_time'] == "2026-10-19T05:00"
+    # Wind of 50 km/h everywhere, but only the requested rows are evaluated
+    assert {a['row'] for a in found if a['rule'] == 'strong_wind'} == {0, 2}
+
+
+def test_engine_queues_each_event_once(tmp_path, monkeypatch):
+    watchlist = pd.DataFrame({"name": ["a", "b"], "latitude": [51.5, 30.0], "longitude": [-0.1, 31.2]})
+    values = {v: np.zeros((2, len(TIMES)), dtype=np.float32) + 50 for v in alerts.VARIABLES}
+    values['rain'][:] = 0
+    values['rain'][0, 3] = 2.0
+    run = [1]
+
+    monkeypatch.setattr(alerts, "latest_model_run", lambda **point: run[0])
+    monkeypatch.setattr(alerts, "fetch_forecasts", lambda *a: (TIMES, {v: x.copy() for v, x in values.items()}, np.ones(2, dtype=bool)))
+    rules = [alerts.DEFAULT_RULES[0]]
+    engine = alerts.AlertEngine(watchlist, rules=rules, queue_path=str(tmp_path / "q.jsonl"), state_path=str(tmp_path / "s.npz"))
+
+    assert [a['location'] for a in engine.run_cycle()] == ["a"]
+
+    # New run changes both forecasts but not the rain event at "a": nothing new to queue
+    values['windspeed_10m'][:, 0] = 5
+    run[0] = 2
+    assert engine.run_cycle() == []
+
+    # The event moves earlier and survives a restart of the engine
+    values['rain'][0, 1] = 1.0
+    run[0] = 3
+    restarted = alerts.AlertEngine(watchlist, rules=rules, queue_path=str(tmp_path / "q.jsonl"), state_path=str(tmp_path / "s.npz"))
+    restarted_alerts = restarted.run_cycle()
+    assert [(a['location'], a['first_time']) for a in restarted_alerts] == [("a", "2026-10-19T01:00")]
+
+    assert len((tmp_path / "q.jsonl").read_text().splitlines()) == 2
+
+
+def test_engine_reloads_state_saved_without_npz_suffix(tmp_path, monkeypatch):
+    watchlist = pd.DataFrame({"name": ["a"], "latitude": [51.5], "longitude": [-0.1]})
+    values = {v: np.zeros((1, len(TIMES)), dtype=np.float32) for v in alerts.VARIABLES}
+
+    monkeypatch.setattr(alerts, "latest_model_run", lambda **point: 7)
+    monkeypatch.setattr(alerts, "fetch_forecasts", lambda *a: (TIMES, values, np.ones(1, dtype=bool)))
+    state_path = str(tmp_path / "state")
+    alerts.AlertEngine(watchlist, queue_path=str(tmp_path / "q.jsonl"), state_path=state_path).run_cycle()
+
+    restarted = alerts.AlertEngine(watchlist, queue_path=str(tmp_path / "q.jsonl"), state_path=state_path)
+    assert restarted.model_run == 7
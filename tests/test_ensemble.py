@@ -0,0 +1,23 @@
+import numpy as np
+
+from ensemble import rain_probability
+
+
+TIMES = np.arange("2026-10-19T00:00", "2026-10-22T00:00", dtype="datetime64[h]").astype("datetime64[m]")
+
+
+def test_rain_probability_counts_members_with_a_full_day():
+    precipitation = np.zeros((4, len(TIMES)), dtype=np.float32)
+    precipitation[:2, 5] = 1.0  # two of four members wet on day one
+    precipitation[3, 30] = 1.0
+    precipitation[3, 24:48] = np.nan  # member 3 misses day two entirely
+    precipitation[:, 60:] = np.nan  # day three only has 12 hours
+
+    probability = rain_probability(TIMES, precipitation)
+
+    assert [str(day) for day in probability.index] == ["2026-10-19", "2026-10-20"]
+    assert probability.tolist() == [0.5, 0.0]
+
+
+def test_rain_probability_without_data():
+    assert rain_probability(TIMES[:0], np.zeros((3, 0))).empty
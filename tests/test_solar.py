@@ -0,0 +1,47 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from solar import sun_times, to_local, utc_offset, local_timezone
+
+
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "sun_times.json"), encoding="utf-8") as f:
+    FIXTURE = json.load(f)
+
+DAYS = [(location, day) for location in FIXTURE['locations'] for day in location['days']]
+
+# The API reports whole minutes
+TOLERANCE = pd.Timedelta(seconds=90)
+
+
+@pytest.mark.parametrize("location, day", DAYS, ids=[f"{l['name']}-{d['date']}" for l, d in DAYS])
+def test_sun_times_match_fixture(location, day):
+    sunrise, sunset = sun_times([day['date']], location['latitude'], location['longitude'])
+    offset = pd.Timedelta(seconds=day['utc_offset_seconds'])
+
+    for computed, expected in [(to_local(sunrise, offset)[0], day['sunrise']), (to_local(sunset, offset)[0], day['sunset'])]:
+        if expected is None:
+            assert pd.isna(computed)
+        else:
+            assert abs(computed - pd.Timestamp(expected)) <= TOLERANCE
+
+
+def test_sun_times_broadcast_dates_against_locations():
+    dates = np.array(["2024-06-21", "2024-12-21"], dtype="datetime64[D]")[:, None]
+    sunrise, sunset = sun_times(dates, [51.5074, 69.6492], [-0.1278, 18.9553])
+
+    assert sunrise.shape == sunset.shape == (2, 2)
+    assert not np.isnat(sunrise[:, 0]).any()
+    assert np.isnat(sunrise[:, 1]).all()
+
+
+def test_to_local_keeps_one_offset_across_dst_change():
+    # Europe/London falls back on 2026-10-25; the hourly axis must stay unique
+    times = pd.date_range("2026-10-24 22:00", periods=6, freq="h")
+    local = to_local(times, utc_offset(local_timezone(51.5074, -0.1278), at="2026-10-24"))
+
+    assert local.is_unique
+    assert (local - times == pd.Timedelta(hours=1)).all()